@@ -4,12 +4,17 @@
 import logging
 import os
 import sys
+import subprocess
 import tempfile
 from pathlib import Path
 import argparse
 import json
 import shutil
 import re
+import hashlib
+import threading
+import time
+import cProfile
 
 # Configure logging
 logging.basicConfig(
@@ -27,13 +32,19 @@ from src.speech_synthesizer import PiperTTSSynthesizer
 from src.audio_mixer import AudioMixer
 from src.config import Config
 
+# Characters stripped from titles when building output file names
+UNSAFE_TITLE_CHARS = re.compile(r'[^\w\s-]')
+
+# Compact JSON separators for intermediate transcript files
+JSON_SEPARATORS = (',', ':')
+
 class EnhancedSpeechTool:
     """Main class for the Enhanced Speech Clarity Tool."""
     
-    def __init__(self, config_path=None):
-        """Initialize the tool with configuration."""
+    def __init__(self, config_path=None, config=None):
+        """Initialize the tool with configuration (loaded from config_path unless given)."""
         # Load configuration
-        self.config = Config(config_path)
+        self.config = config if config is not None else Config(config_path)
         
         # Create temporary directory for processing
         self.temp_dir = Path(tempfile.mkdtemp())
@@ -47,7 +58,13 @@ class EnhancedSpeechTool:
         self.extractor = AudioExtractor(self.temp_dir)
         self.transcriber = WhisperTranscriber(
             model_size=self.config.whisper_model,
-            device=self.config.device
+            device=self.config.device,
+            compute_type=self.config.compute_type,
+            backend=self.config.whisper_backend,
+            vad_filter=self.config.vad_filter,
+            batch_size=self.config.whisper_batch_size,
+            use_daemon=self.config.whisper_daemon,
+            temperature_fallback=self.config.temperature_fallback
         )
         self.text_processor = TextProcessor(
             remove_disfluencies=self.config.remove_disfluencies,
@@ -56,9 +73,15 @@ class EnhancedSpeechTool:
         self.synthesizer = PiperTTSSynthesizer(
             voice=self.config.voice,
             speaker=self.config.speaker,
-            models_dir=self.config.tts_models_dir
+            models_dir=self.config.tts_models_dir,
+            max_workers=self.config.tts_workers
+        )
+        self.mixer = AudioMixer(
+            self.temp_dir,
+            bitrate=self.config.output_bitrate,
+            mp3_quality=self.config.mp3_quality,
+            include_tags=self.config.mp3_tags
         )
-        self.mixer = AudioMixer(self.temp_dir)
     
     def process(self, source, source_type="youtube"):
         """
@@ -72,42 +95,59 @@ class EnhancedSpeechTool:
             Path to the enhanced audio file
         """
         try:
-            # Step 1: Extract audio
+            # Step 1: Extract audio, loading the Whisper model in the background meanwhile
             logger.info("Step 1: Extracting audio...")
+            step_start = time.perf_counter()
+            # A daemon thread, so a cache hit or failed extraction never waits for the load
+            preloader = threading.Thread(target=self._preload_model, name="whisper-preload", daemon=True)
+            preloader.start()
             audio_path, title = self.extractor.extract(source, source_type)
             logger.info(f"Extracted audio to {audio_path}")
+            logger.info(f"Step 1 took {time.perf_counter() - step_start:.2f} seconds")
             
-            # Step 2: Transcribe audio
+            # Step 2: Transcribe audio (reusing a cached transcription if available)
             logger.info("Step 2: Transcribing audio...")
-            transcription = self.transcriber.transcribe(audio_path)
+            step_start = time.perf_counter()
+            cache_path = self._transcript_cache_path(audio_path) if self.config.cache_transcriptions else None
+            transcription = self._load_cached_transcription(cache_path) if cache_path is not None else None
+            if transcription is None:
+                preloader.join()
+                transcription = self.transcriber.transcribe(audio_path)
+                if cache_path is not None:
+                    self._save_cached_transcription(transcription, cache_path)
             
             # Save raw transcription
             raw_transcript_path = self.temp_dir / "raw_transcript.json"
             with open(raw_transcript_path, 'w') as f:
-                json.dump(transcription, f, indent=2)
+                json.dump(transcription, f, separators=JSON_SEPARATORS)
             logger.info(f"Raw transcription saved to {raw_transcript_path}")
+            logger.info(f"Step 2 took {time.perf_counter() - step_start:.2f} seconds")
             
             # Step 3: Process the transcription (remove disfluencies, etc.)
             logger.info("Step 3: Processing transcription...")
+            step_start = time.perf_counter()
             processed_segments = self.text_processor.process(transcription)
             
             # Save processed transcription
             processed_transcript_path = self.temp_dir / "processed_transcript.json"
             with open(processed_transcript_path, 'w') as f:
-                json.dump(processed_segments, f, indent=2)
+                json.dump(processed_segments, f, separators=JSON_SEPARATORS)
             logger.info(f"Processed transcription saved to {processed_transcript_path}")
+            logger.info(f"Step 3 took {time.perf_counter() - step_start:.2f} seconds")
             
-            # Step 4: Synthesize speech
+            # Steps 4 and 5: Synthesize speech and mix audio segments. Segments are
+            # streamed from the synthesizer so mixing overlaps with synthesis.
             logger.info("Step 4: Synthesizing speech...")
-            synthesized_segments = self.synthesizer.synthesize(processed_segments)
+            step_start = time.perf_counter()
+            synthesized_segments = self.synthesizer.synthesize_iter(processed_segments)
             
-            # Step 5: Mix audio segments
             logger.info("Step 5: Mixing audio segments...")
-            safe_title = re.sub(r'[^\w\s-]', '', title).strip().replace(' ', '_')
-            output_path = self.output_dir / f"{safe_title}_enhanced.mp3"
+            safe_title = UNSAFE_TITLE_CHARS.sub('', title).strip().replace(' ', '_')
+            output_path = self.output_dir / f"{safe_title}_enhanced.{self.config.output_format}"
             
             self.mixer.mix(synthesized_segments, output_path)
             logger.info(f"Enhanced audio saved to {output_path}")
+            logger.info(f"Steps 4 and 5 took {time.perf_counter() - step_start:.2f} seconds")
             
             # Also save a text version of the transcript
             text_transcript_path = self.output_dir / f"{safe_title}_transcript.txt"
@@ -124,9 +164,87 @@ class EnhancedSpeechTool:
             logger.error(traceback.format_exc())
             raise
     
+    def _transcript_cache_path(self, audio_path):
+        """
+        Get the cache file for the transcription of an audio file.
+        
+        Args:
+            audio_path: Path to the extracted audio file
+            
+        Returns:
+            Path to the cached transcription, keyed by audio content and model settings
+        """
+        hasher = hashlib.sha256()
+        with open(audio_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                hasher.update(chunk)
+        
+        # The transcription also depends on how the model was run
+        transcriber = self.transcriber
+        hasher.update(
+            f"{transcriber.backend}:{transcriber.model_size}:{transcriber.compute_type}:"
+            f"{transcriber.language}:{transcriber.vad_filter}:{transcriber.temperature_fallback}".encode()
+        )
+        
+        cache_dir = self.config.cache_dir
+        if cache_dir is None:
+            cache_dir = Path.home() / ".cache" / "enhanced_speech"
+        return Path(cache_dir) / f"{hasher.hexdigest()}.json"
+    
+    def _preload_model(self):
+        """Load the Whisper model, leaving any error to surface when transcribing."""
+        try:
+            self.transcriber.preload()
+        except Exception as e:
+            logger.warning(f"Background model load failed: {e}")
+    
+    def _load_cached_transcription(self, cache_path):
+        """
+        Load a cached transcription.
+        
+        Args:
+            cache_path: Path to the cached transcription
+            
+        Returns:
+            Cached transcription, or None if there is no usable cache entry
+        """
+        try:
+            with open(cache_path, 'r') as f:
+                transcription = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable cached transcription {cache_path}: {e}")
+            return None
+        
+        logger.info(f"Loaded cached transcription from {cache_path}")
+        return transcription
+    
+    def _save_cached_transcription(self, transcription, cache_path):
+        """
+        Cache a transcription, replacing the cache file atomically so that an
+        interrupted or concurrent run never leaves a truncated entry behind.
+        
+        Args:
+            transcription: Transcription result
+            cache_path: Path to the cached transcription
+        """
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile('w', dir=cache_path.parent, suffix=".tmp", delete=False) as f:
+            try:
+                json.dump(transcription, f, separators=JSON_SEPARATORS)
+            except BaseException:
+                f.close()
+                os.unlink(f.name)
+                raise
+        os.replace(f.name, cache_path)
+        logger.info(f"Cached transcription to {cache_path}")
+    
     def cleanup(self):
         """Clean up temporary files."""
         try:
+            # Transcriptions are saved next to the extracted audio in the background
+            self.transcriber.close()
             shutil.rmtree(self.temp_dir)
             logger.info(f"Cleaned up temporary directory: {self.temp_dir}")
         except Exception as e:
@@ -150,41 +268,70 @@ def main():
     parser.add_argument("--simplify", action="store_true",
                         help="Simplify language for easier understanding")
     parser.add_argument("-o", "--output-dir", help="Output directory")
+    parser.add_argument("--format", choices=["mp3", "opus", "wav", "raw"],
+                        help="Output audio format (wav and raw skip encoding)")
+    parser.add_argument("--compute-type", choices=["float32", "float16", "int8", "int8_float16"],
+                        help="Whisper computation type")
+    parser.add_argument("--profile", nargs="?", const="profile.prof", metavar="PATH",
+                        help="Profile processing with cProfile and save stats (default: profile.prof)")
     
     args = parser.parse_args()
     
-    # Initialize tool
-    tool = EnhancedSpeechTool(args.config)
-    
-    # Override configuration with command line arguments
+    # Load configuration and override it with command line arguments
+    config = Config(args.config)
     if args.voice:
-        tool.config.voice = args.voice
+        config.voice = args.voice
     if args.no_disfluencies:
-        tool.config.remove_disfluencies = True
+        config.remove_disfluencies = True
     if args.simplify:
-        tool.config.simplify_language = True
+        config.simplify_language = True
     if args.output_dir:
-        tool.config.output_dir = args.output_dir
-        tool.output_dir = Path(args.output_dir)
-        tool.output_dir.mkdir(parents=True, exist_ok=True)
+        config.output_dir = args.output_dir
+    if args.compute_type:
+        config.compute_type = args.compute_type
+    if args.format:
+        config.output_format = args.format
+    
+    # Initialize tool
+    tool = EnhancedSpeechTool(config=config)
     
     try:
         # Process input
         if args.youtube:
-            output_path = tool.process(args.youtube, "youtube")
+            source, source_type = args.youtube, "youtube"
         elif args.file:
-            output_path = tool.process(args.file, "file")
+            source, source_type = args.file, "file"
         elif args.url:
-            output_path = tool.process(args.url, "url")
+            source, source_type = args.url, "url"
+        
+        if args.profile:
+            with cProfile.Profile() as profiler:
+                try:
+                    output_path = tool.process(source, source_type)
+                finally:
+                    profiler.dump_stats(args.profile)
+                    logger.info(f"Profile saved to {args.profile}")
+        else:
+            output_path = tool.process(source, source_type)
         
         print(f"\nProcessing complete!")
         print(f"Enhanced audio saved to: {output_path}")
         
-        # Open the output directory
-        if os.name == 'posix':  # macOS or Linux
-            os.system(f"open {tool.output_dir}")
-        elif os.name == 'nt':   # Windows
-            os.system(f"explorer {tool.output_dir}")
+        # Open the output directory without waiting for the file browser
+        if sys.platform == 'darwin':  # macOS
+            opener = "open"
+        elif os.name == 'posix':      # Linux
+            opener = "xdg-open"
+        elif os.name == 'nt':         # Windows
+            opener = "explorer"
+        else:
+            opener = None
+        
+        if opener is not None:
+            try:
+                subprocess.Popen([opener, str(tool.output_dir)])
+            except OSError as e:
+                logger.warning(f"Could not open output directory: {e}")
     
     finally:
         # Clean up
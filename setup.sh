@@ -99,7 +99,7 @@ install_python_deps() {
     pip install yt-dlp \
                 pydub \
                 tqdm \
-                openai-whisper \
+                faster-whisper \
                 torch torchvision torchaudio --index-url https://download.pytorch.org/whl/cpu
     
     echo -e "${GREEN}✓ Core Python dependencies installed${NC}"
@@ -155,6 +155,7 @@ create_default_config() {
 {
     "output_dir": "enhanced_audio",
     "whisper_model": "base",
+    "whisper_backend": "faster-whisper",
     "device": null,
     "remove_disfluencies": true,
     "simplify_language": false,
@@ -163,7 +164,8 @@ create_default_config() {
     "speaker": 0,
     "maintain_timing": true,
     "output_format": "mp3",
-    "output_bitrate": "192k"
+    "output_bitrate": "192k",
+    "mp3_quality": 5
 }
 EOL
     
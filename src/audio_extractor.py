@@ -8,11 +8,11 @@ import logging
 from pathlib import Path
 import subprocess
 
-import yt_dlp
-from pydub import AudioSegment
-
 logger = logging.getLogger("EnhancedSpeech.AudioExtractor")
 
+# Whisper resamples everything to 16 kHz mono, so extract straight to that
+SAMPLE_RATE = 16000
+
 class AudioExtractor:
     """Class for extracting audio from various sources."""
     
@@ -21,10 +21,9 @@ class AudioExtractor:
         Initialize the audio extractor.
         
         Args:
-            temp_dir: Directory to store temporary files
+            temp_dir: Directory to store temporary files (must already exist)
         """
         self.temp_dir = Path(temp_dir)
-        self.temp_dir.mkdir(parents=True, exist_ok=True)
     
     def extract(self, source, source_type="youtube"):
         """
@@ -56,19 +55,23 @@ class AudioExtractor:
         Returns:
             Tuple of (path to extracted audio file, video title)
         """
+        import yt_dlp
+        
         logger.info(f"Extracting audio from YouTube: {youtube_url}")
         
-        output_file = self.temp_dir / "audio.mp3"
+        output_file = self.temp_dir / "audio.wav"
         
-        # Options for yt-dlp
+        # Options for yt-dlp (extract straight to 16 kHz mono PCM rather than re-encoding to mp3)
         ydl_opts = {
             'format': 'bestaudio/best',
             'postprocessors': [{
                 'key': 'FFmpegExtractAudio',
-                'preferredcodec': 'mp3',
-                'preferredquality': '192',
+                'preferredcodec': 'wav',
             }],
-            'outtmpl': str(output_file).replace(".mp3", ""),
+            'postprocessor_args': {
+                'extractaudio': ['-ac', '1', '-ar', str(SAMPLE_RATE)]
+            },
+            'outtmpl': str(output_file.with_suffix("")),
             'quiet': True,
             'no_warnings': True
         }
@@ -101,16 +104,24 @@ class AudioExtractor:
         if not file_path.exists():
             raise FileNotFoundError(f"File not found: {file_path}")
         
-        output_file = self.temp_dir / "audio.mp3"
+        output_file = self.temp_dir / "audio.wav"
         
-        # Convert to mp3 if necessary
+        # Decode to 16 kHz mono PCM in a single ffmpeg pass
         try:
-            audio = AudioSegment.from_file(str(file_path))
-            audio.export(str(output_file), format="mp3")
+            subprocess.run([
+                "ffmpeg", "-y", "-loglevel", "error",
+                "-i", str(file_path),
+                "-ac", "1", "-ar", str(SAMPLE_RATE),
+                "-f", "wav", str(output_file)
+            ], check=True, capture_output=True)
             
             logger.info(f"Successfully loaded audio file")
             return str(output_file), file_path.name
         
+        except subprocess.CalledProcessError as e:
+            logger.error(f"Error loading audio file: {e.stderr.decode(errors='replace').strip()}")
+            raise
+        
         except Exception as e:
             logger.error(f"Error loading audio file: {e}")
             raise
@@ -127,13 +138,43 @@ class AudioExtractor:
         """
         logger.info(f"Downloading audio from URL: {audio_url}")
         
-        output_file = self.temp_dir / "audio.mp3"
+        output_file = self.temp_dir / "audio.wav"
         
         try:
-            # Use curl or wget to download the file
-            subprocess.run([
-                "curl", "-L", "-s", audio_url, "-o", str(output_file)
-            ], check=True)
+            # Stream the download straight into ffmpeg so decoding overlaps the transfer
+            curl = subprocess.Popen(
+                ["curl", "-L", "-s", "-S", "-N", "--compressed", audio_url],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE
+            )
+            ffmpeg = subprocess.Popen(
+                [
+                    "ffmpeg", "-y", "-loglevel", "error",
+                    "-i", "pipe:0",
+                    "-ac", "1", "-ar", str(SAMPLE_RATE),
+                    "-f", "wav", str(output_file)
+                ],
+                stdin=curl.stdout,
+                # A failed decode is retried from disk, which reports its own error
+                stderr=subprocess.DEVNULL
+            )
+            # Let curl receive SIGPIPE if ffmpeg exits early
+            curl.stdout.close()
+            
+            ffmpeg_returncode = ffmpeg.wait()
+            _, curl_stderr = curl.communicate()
+            
+            # Check the download first, since a failed transfer also makes ffmpeg fail.
+            # A write error (23) or SIGPIPE only means ffmpeg stopped reading early.
+            if curl.returncode not in (0, 23, -13):
+                raise subprocess.CalledProcessError(
+                    curl.returncode, "curl", stderr=curl_stderr.decode(errors="replace").strip()
+                )
+            if ffmpeg_returncode != 0:
+                # Some containers (e.g. MP4/M4A with the moov atom at the end) can only
+                # be demuxed from a seekable input, so decode from a downloaded copy
+                logger.info("Streaming decode failed, retrying from a downloaded copy")
+                self._extract_from_download(audio_url, output_file)
             
             # Get the filename from the URL
             file_name = audio_url.split("/")[-1].split("?")[0] or "audio_from_url"
@@ -141,6 +182,35 @@ class AudioExtractor:
             logger.info(f"Successfully downloaded audio from URL")
             return str(output_file), file_name
         
+        except subprocess.CalledProcessError as e:
+            logger.error(f"Error downloading audio from URL: {e}" + (f": {e.stderr}" if e.stderr else ""))
+            raise
+        
         except Exception as e:
             logger.error(f"Error downloading audio from URL: {e}")
-            raise
\ No newline at end of file
+            raise
+    
+    def _extract_from_download(self, audio_url, output_file):
+        """
+        Download a URL to a temporary file and decode it from disk.
+        
+        Args:
+            audio_url: Direct URL to an audio file
+            output_file: Path to write the 16 kHz mono WAV to
+        """
+        download_file = self.temp_dir / "audio_download"
+        
+        try:
+            subprocess.run(
+                ["curl", "-L", "-s", "-S", "--compressed", "-o", str(download_file), audio_url],
+                check=True, capture_output=True, text=True
+            )
+            subprocess.run([
+                "ffmpeg", "-y", "-loglevel", "error",
+                "-i", str(download_file),
+                "-ac", "1", "-ar", str(SAMPLE_RATE),
+                "-f", "wav", str(output_file)
+            ], check=True, capture_output=True, text=True)
+        
+        finally:
+            download_file.unlink(missing_ok=True)
@@ -3,97 +3,342 @@ Audio mixing module for the Enhanced Speech Tool.
 Handles combining synthesized audio segments into a final audio file.
 """
 
+import functools
 import logging
+import os
+import queue
+import subprocess
+import threading
+import wave
 from pathlib import Path
 import numpy as np
 import tempfile
 
-from pydub import AudioSegment
-
 logger = logging.getLogger("EnhancedSpeech.AudioMixer")
 
+
+def _read_audio(path):
+    """
+    Decode an audio file to 16-bit samples.
+    
+    Args:
+        path: Path to the audio file
+        
+    Returns:
+        Tuple of (int16 sample array, frame rate, channels)
+    """
+    # Include the file's size and mtime in the cache key so rewritten files are re-read
+    stat = os.stat(path)
+    return _read_audio_cached(str(path), stat.st_mtime_ns, stat.st_size)
+
+
+@functools.lru_cache(maxsize=256)
+def _read_audio_cached(path, mtime_ns, size):
+    """Decode an audio file, parsing 16-bit WAV natively and anything else via pydub."""
+    if path.lower().endswith(".wav"):
+        try:
+            with wave.open(path, "rb") as f:
+                if f.getsampwidth() == 2:
+                    samples = np.frombuffer(f.readframes(f.getnframes()), dtype=np.int16)
+                    return samples, f.getframerate(), f.getnchannels()
+        except wave.Error:
+            # Not plain PCM (e.g. float or, before Python 3.12, extensible WAV)
+            pass
+    
+    from pydub import AudioSegment
+    audio = AudioSegment.from_file(path).set_sample_width(2)
+    return np.frombuffer(audio.raw_data, dtype=np.int16), audio.frame_rate, audio.channels
+
+
+class _EncoderPipe:
+    """Feed 16-bit PCM to an ffmpeg encoder process from a background thread."""
+    
+    def __init__(self, command):
+        """
+        Start the encoder.
+        
+        Args:
+            command: ffmpeg command line reading s16le PCM from stdin
+        """
+        self._process = subprocess.Popen(
+            command,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE
+        )
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._write_loop, daemon=True)
+        self._thread.start()
+    
+    def _write_loop(self):
+        """Write queued sample blocks to the encoder until the end marker."""
+        failed = False
+        while True:
+            samples = self._queue.get()
+            if samples is None:
+                break
+            
+            # Keep draining after a failure so producers never block
+            if not failed:
+                try:
+                    self._process.stdin.write(samples.tobytes())
+                except (BrokenPipeError, OSError):
+                    failed = True
+    
+    def write(self, samples):
+        """
+        Queue samples for encoding without waiting for the encoder.
+        
+        Args:
+            samples: Interleaved int16 numpy array
+        """
+        self._queue.put(samples)
+    
+    def close(self):
+        """Finish encoding and wait for the encoder to exit."""
+        self._queue.put(None)
+        self._thread.join()
+        
+        try:
+            self._process.stdin.close()
+        except BrokenPipeError:
+            pass
+        stderr = self._process.stderr.read().decode(errors="replace")
+        self._process.wait()
+        
+        if self._process.returncode != 0:
+            raise RuntimeError(f"Audio encoding failed: {stderr.strip()}")
+    
+    def abort(self):
+        """Stop the encoder without finishing the output."""
+        self._process.kill()
+        self._queue.put(None)
+        self._thread.join()
+        self._process.wait()
+        
+        for pipe in (self._process.stdin, self._process.stderr):
+            try:
+                pipe.close()
+            except OSError:
+                pass
+
+
 class AudioMixer:
     """Class for mixing and combining audio segments."""
     
-    def __init__(self, temp_dir):
+    # Output formats selectable by file extension
+    OUTPUT_FORMATS = ("mp3", "opus", "wav", "raw")
+    
+    def __init__(self, temp_dir, bitrate="192k", mp3_quality=5, include_tags=False):
         """
         Initialize the audio mixer.
         
         Args:
-            temp_dir: Directory for temporary files
+            temp_dir: Directory for temporary files (must already exist)
+            bitrate: MP3 output bitrate
+            mp3_quality: LAME algorithm quality, 0 (slowest, best) to 9 (fastest)
+            include_tags: Whether to write ID3 tags to the output file
         """
         self.temp_dir = Path(temp_dir)
-        self.temp_dir.mkdir(parents=True, exist_ok=True)
-        logger.info(f"Initialized AudioMixer with temp_dir={temp_dir}")
+        self.bitrate = bitrate
+        self.mp3_quality = mp3_quality
+        self.include_tags = include_tags
+        self._output_dirs = set()  # Output directories known to exist
+        self._scratch = None  # Mix buffer reused across calls
+        logger.info(f"Initialized AudioMixer with temp_dir={temp_dir}, bitrate={bitrate}, mp3_quality={mp3_quality}")
     
     def mix(self, segments, output_path, maintain_timing=True):
         """
         Mix audio segments into a single file.
+        The output format follows the file extension: "wav" and "raw" are written
+        without encoding, "opus" uses libopus, and "mp3" is encoded as MP3.
         
         Args:
-            segments: List of segments with audio file paths
+            segments: Iterable of segments with in-memory "samples" and "sample_rate"
+                or an "audio_file" path (may be a generator that is still producing segments)
             output_path: Path to the output file
             maintain_timing: Whether to maintain original timing with silence
             
         Returns:
             Path to the output file
         """
-        logger.info(f"Mixing {len(segments)} audio segments to {output_path}")
+        logger.info(f"Mixing audio segments to {output_path}")
         
-        # Create combined audio
-        combined = AudioSegment.silent(duration=0)
+        # The output format follows the file extension. Encoded formats are
+        # streamed to ffmpeg as segments arrive, so encoding overlaps synthesis.
+        output_path = Path(output_path)
+        output_format = output_path.suffix.lstrip(".").lower() or "wav"
+        if output_format not in self.OUTPUT_FORMATS:
+            raise ValueError(
+                f"Unsupported output format '{output_format}', expected one of {', '.join(self.OUTPUT_FORMATS)}"
+            )
+        streaming = output_format not in ("wav", "raw")
+        
+        # Ensure output directory exists
+        if output_path.parent not in self._output_dirs:
+            output_path.parent.mkdir(parents=True, exist_ok=True)
+            self._output_dirs.add(output_path.parent)
+        
+        encoder = None
+        written = 0  # Frames already sent to the encoder
+        
+        # Decoded segments and their frame offsets in the output. Unencoded output
+        # is assembled in a single preallocated buffer at the end, since repeatedly
+        # concatenating AudioSegments copies the whole growing output every time.
+        clips = []
+        num_clips = 0
+        frame_rate = None
+        channels = None
         
         # Track timing for maintaining original spacing
         last_end_time = 0
+        cursor = 0  # Output position in frames
         
-        # Process each segment
-        for i, segment in enumerate(segments):
-            try:
-                # Load audio file
-                audio_file = segment.get("audio_file")
-                if not audio_file:
-                    logger.warning(f"Segment {i} has no audio file, skipping")
-                    continue
-                
-                audio = AudioSegment.from_file(audio_file)
-                
-                if maintain_timing:
-                    # Add silence to maintain original timing
-                    start_time = segment.get("start", last_end_time)
-                    silence_duration = max(0, (start_time - last_end_time) * 1000)  # Convert to ms
+        try:
+            # Process each segment
+            for i, segment in enumerate(segments):
+                try:
+                    if "samples" in segment:
+                        # Synthesized mono PCM handed over in memory
+                        samples = segment["samples"]
+                        segment_rate = segment["sample_rate"]
+                        segment_channels = 1
+                    else:
+                        # Load audio file
+                        audio_file = segment.get("audio_file")
+                        if not audio_file:
+                            logger.warning("Segment %d has no audio, skipping", i)
+                            continue
+                        
+                        samples, segment_rate, segment_channels = _read_audio(audio_file)
                     
-                    if silence_duration > 0:
-                        combined += AudioSegment.silent(duration=silence_duration)
+                    # Use the format of the first segment for the whole output
+                    if frame_rate is None:
+                        frame_rate = segment_rate
+                        channels = segment_channels
+                    elif (segment_rate, segment_channels) != (frame_rate, channels):
+                        from pydub import AudioSegment
+                        audio = AudioSegment(
+                            data=samples.tobytes(),
+                            sample_width=2,
+                            frame_rate=segment_rate,
+                            channels=segment_channels
+                        ).set_frame_rate(frame_rate).set_channels(channels)
+                        samples = np.frombuffer(audio.raw_data, dtype=np.int16)
+                    duration = len(samples) / (frame_rate * channels)
                     
-                    # Update last end time
-                    last_end_time = segment.get("end", start_time + (len(audio) / 1000))
-                
-                # Add audio to combined output
-                combined += audio
+                    if maintain_timing:
+                        # Leave a gap to maintain original timing
+                        start_time = segment.get("start", last_end_time)
+                        silence_duration = max(0, start_time - last_end_time)
+                        cursor += int(silence_duration * frame_rate)
+                        
+                        # Update last end time
+                        last_end_time = segment.get("end", start_time + duration)
+                    
+                    if streaming:
+                        if encoder is None:
+                            encoder = self._start_encoder(output_path, output_format, frame_rate, channels)
+                            silence = np.zeros(frame_rate * channels, dtype=np.int16)
+                        
+                        # Pad the gap with views of one shared silent block, then hand
+                        # the segment to the encoder thread
+                        gap = (cursor - written) * channels
+                        while gap > 0:
+                            encoder.write(silence[:gap])
+                            gap -= len(silence)
+                        encoder.write(samples)
+                        written = cursor + len(samples) // channels
+                    else:
+                        clips.append((cursor, samples))
+                    
+                    num_clips += 1
+                    cursor += len(samples) // channels
+                    
+                except Exception as e:
+                    logger.error("Error processing segment %d: %s", i, e)
+                    # Continue with next segment
+            
+            logger.info(f"Mixed {num_clips} audio segments")
+            
+            if frame_rate is None:
+                frame_rate, channels = 22050, 1
+            
+            if streaming:
+                if encoder is None:
+                    encoder = self._start_encoder(output_path, output_format, frame_rate, channels)
+                encoder.close()
+                encoder = None
+            else:
+                # Copy every segment into place; gaps are left as zeros (silence).
+                # The buffer is kept between calls and grown geometrically.
+                total_samples = cursor * channels
+                if self._scratch is None or self._scratch.size < total_samples:
+                    self._scratch = np.empty(total_samples * 2, dtype=np.int16)
+                buffer = self._scratch[:total_samples]
+                buffer.fill(0)
+                for offset, samples in clips:
+                    start = offset * channels
+                    buffer[start:start + len(samples)] = samples
                 
-            except Exception as e:
-                logger.error(f"Error processing segment {i}: {e}")
-                # Continue with next segment
+                if output_format == "wav":
+                    # Write the samples as they are, without an encoder
+                    with wave.open(str(output_path), "wb") as f:
+                        f.setnchannels(channels)
+                        f.setsampwidth(2)
+                        f.setframerate(frame_rate)
+                        f.writeframes(buffer)
+                else:
+                    # Headerless 16-bit PCM for numpy consumers
+                    buffer.tofile(output_path)
+        finally:
+            # Stop the encoder if mixing was interrupted
+            if encoder is not None:
+                encoder.abort()
         
-        # Ensure output directory exists
-        output_path = Path(output_path)
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-        
-        # Export final audio
-        combined.export(
-            str(output_path),
-            format="mp3",
-            bitrate="192k",
-            tags={
+        logger.info(f"Successfully mixed audio segments into {output_path}")
+        return str(output_path)
+    
+    def _start_encoder(self, output_path, output_format, frame_rate, channels):
+        """
+        Start an ffmpeg process encoding 16-bit PCM from stdin to the output file.
+        
+        Args:
+            output_path: Path to the output file
+            output_format: "opus" for libopus or "mp3" for MP3
+            frame_rate: Sample rate of the PCM
+            channels: Number of interleaved channels in the PCM
+            
+        Returns:
+            _EncoderPipe accepting int16 sample arrays
+        """
+        command = [
+            "ffmpeg", "-y", "-nostats", "-loglevel", "error",
+            "-f", "s16le", "-ar", str(frame_rate), "-ac", str(channels), "-i", "-"
+        ]
+        
+        if output_format == "opus":
+            command += ["-c:a", "libopus", "-b:a", "96k", "-vbr", "on", "-application", "voip", "-f", "opus"]
+        else:
+            # libmp3lame's algorithm quality is ffmpeg's -compression_level;
+            # -q:a would switch the encoder to VBR instead
+            command += [
+                "-c:a", "libmp3lame", "-b:a", self.bitrate,
+                "-compression_level", str(int(self.mp3_quality)), "-f", "mp3"
+            ]
+        
+        if self.include_tags:
+            tags = {
                 "title": output_path.stem,
                 "artist": "Enhanced Speech Tool",
                 "album": "Speech Enhancement",
                 "comment": "Generated with Enhanced Speech Tool"
             }
-        )
+            for key, value in tags.items():
+                command += ["-metadata", f"{key}={value}"]
         
-        logger.info(f"Successfully mixed audio segments into {output_path}")
-        return str(output_path)
+        command.append(str(output_path))
+        return _EncoderPipe(command)
     
     def create_audio_visualization(self, audio_path, output_path=None):
         """
@@ -117,11 +362,8 @@ class AudioMixer:
         
         # Create a simple waveform image
         try:
-            # Load audio
-            audio = AudioSegment.from_file(audio_path)
-            
-            # Extract samples
-            samples = np.array(audio.get_array_of_samples())
+            # Load audio as a zero-copy view of the decoded samples
+            samples, frame_rate, channels = _read_audio(audio_path)
             
             # Here you would use matplotlib to create a waveform visualization
             # For simplicity, we're just creating a placeholder file
@@ -20,7 +20,15 @@ class Config:
         
         # Whisper settings
         "whisper_model": "base",  # tiny, base, small, medium, large
+        "whisper_backend": "faster-whisper",  # faster-whisper, openai-whisper
         "device": None,  # None for auto-detect, "cpu", or "cuda"
+        "compute_type": None,  # None for auto, "float32", "float16", "int8", or "int8_float16"
+        "vad_filter": True,  # Skip non-speech audio before transcription
+        "whisper_batch_size": None,  # None for 16 on CUDA, unbatched on CPU
+        "whisper_daemon": False,  # Keep the model loaded in a background daemon
+        "temperature_fallback": True,  # Re-decode failed windows at higher temperatures
+        "cache_transcriptions": True,  # Reuse transcriptions of identical audio
+        "cache_dir": None,  # None for ~/.cache/enhanced_speech
         
         # Text processing settings
         "remove_disfluencies": True,
@@ -31,11 +39,14 @@ class Config:
         "voice": "en_US-lessac-medium",  # For Piper
         "speaker": 0,  # For multi-speaker models
         "tts_models_dir": None,  # None for default location
+        "tts_workers": None,  # Concurrent synthesis processes, None for one per CPU
         
         # Audio settings
         "maintain_timing": True,
-        "output_format": "mp3",
+        "output_format": "mp3",  # mp3, opus, wav (no encoding), raw (16-bit PCM)
         "output_bitrate": "192k",
+        "mp3_quality": 5,  # LAME algorithm quality, 0 (slowest, best) to 9 (fastest)
+        "mp3_tags": False,  # Write ID3 tags to the output file
         
         # Experimental features
         "experimental": {
@@ -61,6 +72,10 @@ class Config:
         # Load configuration from environment variables
         self._load_from_env()
         
+        # Promote settings to real attributes so reads skip __getattr__
+        for key, value in self._config.items():
+            object.__setattr__(self, key, value)
+        
         logger.info(f"Initialized Config with {len(self._config)} settings")
     
     def _load_from_file(self, config_path):
@@ -87,16 +102,27 @@ class Config:
         env_mapping = {
             "ESH_OUTPUT_DIR": "output_dir",
             "ESH_WHISPER_MODEL": "whisper_model",
+            "ESH_WHISPER_BACKEND": "whisper_backend",
             "ESH_DEVICE": "device",
+            "ESH_COMPUTE_TYPE": "compute_type",
+            "ESH_VAD_FILTER": "vad_filter",
+            "ESH_WHISPER_BATCH_SIZE": "whisper_batch_size",
+            "ESH_WHISPER_DAEMON": "whisper_daemon",
+            "ESH_TEMPERATURE_FALLBACK": "temperature_fallback",
+            "ESH_CACHE_TRANSCRIPTIONS": "cache_transcriptions",
+            "ESH_CACHE_DIR": "cache_dir",
             "ESH_REMOVE_DISFLUENCIES": "remove_disfluencies",
             "ESH_SIMPLIFY_LANGUAGE": "simplify_language",
             "ESH_TTS_ENGINE": "tts_engine",
             "ESH_VOICE": "voice",
             "ESH_SPEAKER": "speaker",
             "ESH_TTS_MODELS_DIR": "tts_models_dir",
+            "ESH_TTS_WORKERS": "tts_workers",
             "ESH_MAINTAIN_TIMING": "maintain_timing",
             "ESH_OUTPUT_FORMAT": "output_format",
-            "ESH_OUTPUT_BITRATE": "output_bitrate"
+            "ESH_OUTPUT_BITRATE": "output_bitrate",
+            "ESH_MP3_QUALITY": "mp3_quality",
+            "ESH_MP3_TAGS": "mp3_tags"
         }
         
         # Update configuration with values from environment variables
@@ -154,21 +180,6 @@ class Config:
         except Exception as e:
             logger.error(f"Error saving configuration to {config_path}: {e}")
     
-    def __getattr__(self, name):
-        """
-        Get configuration attribute.
-        
-        Args:
-            name: Attribute name
-            
-        Returns:
-            Configuration value
-        """
-        if name in self._config:
-            return self._config[name]
-        else:
-            raise AttributeError(f"Configuration has no attribute '{name}'")
-    
     def __setattr__(self, name, value):
         """
         Set configuration attribute.
@@ -177,12 +188,8 @@ class Config:
             name: Attribute name
             value: Attribute value
         """
-        if name == "_config":
-            # Set the internal configuration dictionary
-            super().__setattr__(name, value)
-        elif name in self._config:
-            # Update configuration value
+        if name != "_config" and name in self._config:
+            # Keep the saved configuration in sync with the attribute
             self._config[name] = value
-        else:
-            # Set attribute normally
-            super().__setattr__(name, value)
\ No newline at end of file
+        
+        super().__setattr__(name, value)
\ No newline at end of file
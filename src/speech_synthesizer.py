@@ -8,15 +8,80 @@ import os
 import subprocess
 import tempfile
 from pathlib import Path
+import functools
 import json
-import shutil
+import wave
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+from itertools import chain, repeat
+
+import numpy as np
 
 logger = logging.getLogger("EnhancedSpeech.SpeechSynthesizer")
 
+
+@functools.lru_cache(maxsize=None)
+def _probe_piper(voice, models_dir):
+    """
+    Check if Piper is installed and download the voice model if needed.
+    Memoized so that synthesizers created in the same process share one probe.
+    
+    Args:
+        voice: Piper voice model name
+        models_dir: Directory containing Piper voice models
+    
+    Returns:
+        Path to the voice model
+    """
+    # Try to find piper executable
+    try:
+        result = subprocess.run(
+            ["piper", "--help"],
+            capture_output=True, 
+            text=True, 
+            check=False
+        )
+        
+        if result.returncode != 0:
+            logger.warning("Piper not found. Make sure it's installed and in your PATH.")
+            logger.warning("Install with: pip install piper-tts")
+            raise RuntimeError("Piper TTS not found")
+        
+    except FileNotFoundError:
+        logger.error("Piper executable not found. Please install Piper TTS.")
+        logger.error("pip install piper-tts")
+        raise RuntimeError("Piper TTS not installed")
+    
+    # Check for voice models
+    voice_path = models_dir / f"{voice}.onnx"
+    if not voice_path.exists():
+        logger.warning(f"Voice model not found: {voice_path}")
+        logger.warning(f"Attempting to download voice model...")
+        
+        # Create models directory if it doesn't exist
+        models_dir.mkdir(parents=True, exist_ok=True)
+        
+        # Try to download the model
+        try:
+            subprocess.run(
+                ["piper-download", "--voice", voice],
+                check=True
+            )
+            logger.info(f"Successfully downloaded voice model: {voice}")
+        except Exception as e:
+            logger.error(f"Failed to download voice model: {e}")
+            raise RuntimeError(f"Voice model {voice} not found and could not be downloaded")
+    
+    return voice_path
+
+
 class PiperTTSSynthesizer:
     """Class for synthesizing speech using Piper TTS."""
     
-    def __init__(self, voice="en_US-lessac-medium", speaker=0, models_dir=None):
+    # Number of distinct texts whose synthesized samples are kept in memory
+    CACHE_SIZE = 512
+    
+    def __init__(self, voice="en_US-lessac-medium", speaker=0, models_dir=None, max_workers=None):
         """
         Initialize the speech synthesizer.
         
@@ -24,9 +89,11 @@ class PiperTTSSynthesizer:
             voice: Piper voice model name
             speaker: Speaker ID for multi-speaker models
             models_dir: Directory containing Piper voice models
+            max_workers: Number of concurrent Piper processes (None for one per CPU)
         """
         self.voice = voice
         self.speaker = speaker
+        self.max_workers = max_workers or os.cpu_count() or 1
         
         # Set default models directory if not provided
         if models_dir is None:
@@ -35,50 +102,76 @@ class PiperTTSSynthesizer:
             self.models_dir = Path(models_dir)
         
         # Verify Piper is installed
-        self._check_piper_installation()
+        self._voice_path = _probe_piper(self.voice, self.models_dir)
+        
+        # Command line prefix shared by every piper CLI call
+        self._piper_command = ["piper", "--model", str(self._voice_path), "--speaker", str(self.speaker)]
+        
+        # Piper emits raw PCM at the voice model's native sample rate
+        self._voice_config = self._load_voice_config()
+        self.sample_rate = self._voice_config["audio"]["sample_rate"]
+        
+        # Load the voice model once for in-process synthesis (None to use the piper CLI)
+        self._piper_synthesis_config = None
+        self._piper_voice = self._load_piper_voice()
         
-        logger.info(f"Initialized PiperTTSSynthesizer with voice={voice}, speaker={speaker}")
+        # Repeated utterances ("yes", "okay", ...) are synthesized once per instance,
+        # which already fixes the voice and speaker
+        self._synthesize_text_cached = functools.lru_cache(maxsize=self.CACHE_SIZE)(self._synthesize_text)
+        
+        logger.info(f"Initialized PiperTTSSynthesizer with voice={voice}, speaker={speaker}, max_workers={self.max_workers}")
+    
+    def _load_voice_config(self):
+        """
+        Load the JSON config that accompanies the Piper voice model.
+        
+        Returns:
+            Dictionary with the voice model config
+        """
+        with open(f"{self._voice_path}.json", 'r') as f:
+            return json.load(f)
     
-    def _check_piper_installation(self):
-        """Check if Piper is installed and download models if needed."""
-        # Try to find piper executable
+    def _load_piper_voice(self):
+        """
+        Load the Piper voice model into a single ONNX Runtime session shared by all segments.
+        
+        Returns:
+            PiperVoice instance, or None if the piper Python package is unavailable
+        """
         try:
-            result = subprocess.run(
-                ["piper", "--help"],
-                capture_output=True, 
-                text=True, 
-                check=False
-            )
-            
-            if result.returncode != 0:
-                logger.warning("Piper not found. Make sure it's installed and in your PATH.")
-                logger.warning("Install with: pip install piper-tts")
-                raise RuntimeError("Piper TTS not found")
-            
-        except FileNotFoundError:
-            logger.error("Piper executable not found. Please install Piper TTS.")
-            logger.error("pip install piper-tts")
-            raise RuntimeError("Piper TTS not installed")
+            import onnxruntime
+            from piper.config import PiperConfig
+            from piper.voice import PiperVoice
+        except ImportError:
+            logger.info("Piper Python package not available, synthesizing with the piper CLI")
+            return None
         
-        # Check for voice models
-        voice_path = self.models_dir / f"{self.voice}.onnx"
-        if not voice_path.exists():
-            logger.warning(f"Voice model not found: {voice_path}")
-            logger.warning(f"Attempting to download voice model...")
-            
-            # Create models directory if it doesn't exist
-            self.models_dir.mkdir(parents=True, exist_ok=True)
-            
-            # Try to download the model
+        # piper-tts < 1.3 streams raw PCM; later releases yield audio chunks
+        # from synthesize() and take the speaker through a SynthesisConfig
+        if not hasattr(PiperVoice, "synthesize_stream_raw"):
             try:
-                subprocess.run(
-                    ["piper-download", "--voice", self.voice],
-                    check=True
-                )
-                logger.info(f"Successfully downloaded voice model: {self.voice}")
-            except Exception as e:
-                logger.error(f"Failed to download voice model: {e}")
-                raise RuntimeError(f"Voice model {self.voice} not found and could not be downloaded")
+                from piper.config import SynthesisConfig
+            except ImportError:
+                logger.info("Unsupported Piper Python API, synthesizing with the piper CLI")
+                return None
+            speaker_id = self.speaker if self._voice_config.get("num_speakers", 1) > 1 else None
+            self._piper_synthesis_config = SynthesisConfig(speaker_id=speaker_id)
+        
+        model_path = self._voice_path
+        config = PiperConfig.from_dict(self._voice_config)
+        
+        # Split the CPU between the concurrent synthesis workers
+        options = onnxruntime.SessionOptions()
+        options.intra_op_num_threads = max(1, (os.cpu_count() or 1) // self.max_workers)
+        options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+        session = onnxruntime.InferenceSession(
+            str(model_path),
+            sess_options=options,
+            providers=["CPUExecutionProvider"]
+        )
+        
+        logger.info(f"Loaded Piper voice model: {model_path}")
+        return PiperVoice(config=config, session=session)
     
     def synthesize(self, segments):
         """
@@ -88,98 +181,228 @@ class PiperTTSSynthesizer:
             segments: List of processed transcription segments
             
         Returns:
-            List of segments with audio file paths
+            List of segments with synthesized samples
+        """
+        return list(self.synthesize_iter(segments))
+    
+    def synthesize_iter(self, segments):
+        """
+        Synthesize speech for transcription segments, yielding each one in order
+        as soon as it is ready so that consumers can overlap with synthesis.
+        
+        Args:
+            segments: List of processed transcription segments
+            
+        Yields:
+            Segments with synthesized int16 samples and their sample rate
         """
         logger.info(f"Synthesizing speech for {len(segments)} segments")
         
-        synthesized_segments = []
+        num_synthesized = 0
         
-        # Create temporary directory for synthesized audio
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_dir = Path(temp_dir)
+        with ExitStack() as stack:
+            if self._piper_voice is None:
+                # Batched CLI synthesis can only write files, so it needs a scratch directory
+                temp_dir = Path(stack.enter_context(tempfile.TemporaryDirectory()))
+            executor = stack.enter_context(ThreadPoolExecutor(max_workers=self.max_workers))
             
-            # Process each segment
-            for i, segment in enumerate(segments):
-                text = segment["text"].strip()
-                start_time = segment["start"]
-                end_time = segment["end"]
-                
-                # Skip empty segments
-                if not text:
-                    logger.debug(f"Skipping empty segment {i}")
+            if self._piper_voice is not None:
+                # Segments share the loaded voice, so synthesize them concurrently
+                results = executor.map(
+                    self._synthesize_segment,
+                    range(len(segments)),
+                    segments
+                )
+            else:
+                # Give each worker one contiguous batch so the piper CLI loads
+                # the voice model once per worker rather than once per segment
+                indexed_segments = list(enumerate(segments))
+                batch_size = max(1, -(-len(segments) // self.max_workers))
+                batches = [
+                    indexed_segments[i:i + batch_size]
+                    for i in range(0, len(indexed_segments), batch_size)
+                ]
+                results = chain.from_iterable(
+                    executor.map(self._synthesize_batch, batches, repeat(temp_dir))
+                )
+            
+            for segment in results:
+                if segment is None:
                     continue
                 
-                # Create output file path
-                output_file = temp_dir / f"segment_{i:04d}.wav"
-                
-                # Synthesize speech
-                try:
-                    self._synthesize_text(text, output_file)
-                    
-                    # Add synthesized audio to segment
-                    synthesized_segments.append({
-                        "text": text,
-                        "start": start_time,
-                        "end": end_time,
-                        "audio_file": str(output_file)
-                    })
-                    
-                except Exception as e:
-                    logger.error(f"Error synthesizing segment {i}: {e}")
-                    # Continue with next segment if one fails
-                    continue
+                num_synthesized += 1
+                yield segment
+        
+        if segments and num_synthesized == 0:
+            raise RuntimeError(f"Speech synthesis failed for all {len(segments)} segments")
+        
+        logger.info(f"Successfully synthesized {num_synthesized} segments")
+    
+    def _synthesize_batch(self, indexed_segments, temp_dir):
+        """
+        Synthesize speech for several segments with a single piper CLI process.
+        
+        Args:
+            indexed_segments: List of (index, segment) pairs
+            temp_dir: Directory for Piper to write the synthesized audio to
+            
+        Returns:
+            List of segments with synthesized samples, in input order
+        """
+        jobs = []
+        output_files = {}  # One output file per distinct text
+        for index, segment in indexed_segments:
+            text = segment["text"].strip()
             
-            logger.info(f"Successfully synthesized {len(synthesized_segments)} segments")
+            # Skip empty segments
+            if not text:
+                logger.debug("Skipping empty segment %d", index)
+                continue
             
-            # Copy the synthesized files to a more persistent location if needed
-            # (This is a basic implementation - in a real app, you might want to handle this differently)
-            result_segments = []
-            for segment in synthesized_segments:
-                source_file = Path(segment["audio_file"])
-                target_file = Path(tempfile.gettempdir()) / source_file.name
-                shutil.copy2(source_file, target_file)
+            if text not in output_files:
+                output_files[text] = temp_dir / f"segment_{index:04d}.wav"
+            jobs.append((index, segment, text, output_files[text]))
+        
+        if not jobs:
+            return []
+        
+        # One JSON request per line, each naming its own output file
+        requests = "".join(
+            json.dumps({"text": text, "output_file": str(output_file)}) + "\n"
+            for text, output_file in output_files.items()
+        )
+        
+        result = subprocess.run(
+            [*self._piper_command, "--output_dir", str(temp_dir), "--json-input"],
+            input=requests,
+            capture_output=True,
+            text=True
+        )
+        
+        if result.returncode != 0:
+            # Older Piper builds have no JSON input; synthesize one segment at a time
+            logger.warning(f"Batched Piper synthesis failed, falling back to per-segment synthesis: {result.stderr.strip()}")
+            results = (self._synthesize_segment(index, segment) for index, segment in indexed_segments)
+            return [segment for segment in results if segment is not None]
+        
+        synthesized_segments = []
+        samples_by_text = {}
+        for index, segment, text, output_file in jobs:
+            if text not in samples_by_text:
+                if not output_file.exists():
+                    logger.error("Error synthesizing segment %d: Piper produced no audio", index)
+                    continue
                 
-                segment_copy = segment.copy()
-                segment_copy["audio_file"] = str(target_file)
-                result_segments.append(segment_copy)
+                # Read the samples now; the scratch directory is removed after synthesis
+                with wave.open(str(output_file), "rb") as wav_file:
+                    pcm = wav_file.readframes(wav_file.getnframes())
+                samples_by_text[text] = np.frombuffer(pcm, dtype=np.int16)
+            
+            synthesized_segments.append({
+                "text": text,
+                "start": segment["start"],
+                "end": segment["end"],
+                "samples": samples_by_text[text],
+                "sample_rate": self.sample_rate
+            })
+        
+        return synthesized_segments
+    
+    def _synthesize_segment(self, index, segment):
+        """
+        Synthesize speech for a single transcription segment.
+        
+        Args:
+            index: Segment index, used in log messages
+            segment: Processed transcription segment
             
-            return result_segments
+        Returns:
+            Segment with synthesized samples, or None if the segment was skipped or failed
+        """
+        text = segment["text"].strip()
+        
+        # Skip empty segments
+        if not text:
+            logger.debug("Skipping empty segment %d", index)
+            return None
+        
+        # Synthesize speech
+        try:
+            samples = self._synthesize_text_cached(text)
+        except Exception as e:
+            logger.error("Error synthesizing segment %d: %s", index, e)
+            # Continue with next segment if one fails
+            return None
+        
+        # Add synthesized audio to segment
+        return {
+            "text": text,
+            "start": segment["start"],
+            "end": segment["end"],
+            "samples": samples,
+            "sample_rate": self.sample_rate
+        }
     
-    def _synthesize_text(self, text, output_file):
+    def _synthesize_text(self, text):
         """
         Synthesize speech for a text segment.
         
         Args:
             text: Text to synthesize
-            output_file: Output audio file path
             
         Returns:
-            None
+            Mono int16 numpy array of samples at self.sample_rate
         """
+        if self._piper_voice is not None:
+            return self._synthesize_text_in_process(text)
+        
         try:
-            # Run Piper to synthesize speech
-            process = subprocess.Popen(
-                [
-                    "piper",
-                    "--model", str(self.models_dir / f"{self.voice}.onnx"),
-                    "--output_file", str(output_file),
-                    "--speaker", str(self.speaker)
-                ],
-                stdin=subprocess.PIPE,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True
+            # Run Piper to synthesize speech, sending the text on stdin and
+            # reading raw 16-bit PCM back from stdout
+            result = subprocess.run(
+                [*self._piper_command, "--output_raw"],
+                input=text.encode(),
+                capture_output=True
             )
             
-            # Send text to synthesize
-            stdout, stderr = process.communicate(input=text)
-            
-            if process.returncode != 0:
-                logger.error(f"Piper synthesis failed: {stderr}")
+            if result.returncode != 0:
+                stderr = result.stderr.decode(errors="replace")
+                logger.error("Piper synthesis failed: %s", stderr)
                 raise RuntimeError(f"Speech synthesis failed: {stderr}")
             
-            logger.debug(f"Synthesized text: '{text[:50]}...' to {output_file}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Synthesized text: '%s...'", text[:50])
+            return np.frombuffer(result.stdout, dtype=np.int16)
+            
+        except Exception as e:
+            logger.error("Error synthesizing text: %s", e)
+            raise
+    
+    def _synthesize_text_in_process(self, text):
+        """
+        Synthesize speech for a text segment with the preloaded Piper voice.
+        
+        Args:
+            text: Text to synthesize
+            
+        Returns:
+            Mono int16 numpy array of samples at self.sample_rate
+        """
+        try:
+            if self._piper_synthesis_config is not None:
+                pcm = b"".join(
+                    chunk.audio_int16_bytes
+                    for chunk in self._piper_voice.synthesize(text, syn_config=self._piper_synthesis_config)
+                )
+            else:
+                # Single-speaker models have no speaker input
+                speaker_id = self.speaker if self._piper_voice.config.num_speakers > 1 else None
+                pcm = b"".join(self._piper_voice.synthesize_stream_raw(text, speaker_id=speaker_id))
+            
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Synthesized text: '%s...'", text[:50])
+            return np.frombuffer(pcm, dtype=np.int16)
             
         except Exception as e:
-            logger.error(f"Error synthesizing text: {e}")
-            raise
\ No newline at end of file
+            logger.error("Error synthesizing text: %s", e)
+            raise
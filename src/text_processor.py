@@ -32,6 +32,34 @@ class TextProcessor:
         r"\b(I|we|they|he|she) (don't|doesn't|didn't) (mean|think|want|like)( \w+)+ (I|we|they|he|she) (mean|think|want|like)\b"
     ]
     
+    # Complex words (lowercase, one entry per inflection) and their simpler replacements
+    COMPLEX_WORDS = {
+        'utilize': 'use',
+        'procure': 'get',
+        'optimal': 'best',
+        'purchase': 'buy',
+        'sufficient': 'enough',
+        'require': 'need',
+        'obligation': 'duty',
+        'terminate': 'end',
+        'termination': 'end',
+        'initiate': 'start',
+        'finalize': 'finish',
+        'finalized': 'finish',
+        'subsequent': 'later',
+        'subsequently': 'later',
+    }
+    
+    # Patterns above compiled once, with each list combined into a single alternation
+    _DISFLUENCY_RE = re.compile('|'.join(f'(?:{p})' for p in DISFLUENCIES), re.IGNORECASE)
+    _REPETITION_RE = re.compile('|'.join(f'(?:{p})' for p in REPETITIONS))
+    _FALSE_START_RE = re.compile('|'.join(f'(?:{p})' for p in FALSE_STARTS), re.IGNORECASE)
+    _FALSE_START_SPLIT_RE = re.compile(r'\b(but|I mean|I think)\b', re.IGNORECASE)
+    _COMPLEX_WORD_RE = re.compile(r'\b(' + '|'.join(map(re.escape, COMPLEX_WORDS)) + r')\b', re.IGNORECASE)
+    _WHITESPACE_RE = re.compile(r'\s+')
+    _SPACE_BEFORE_PUNCTUATION_RE = re.compile(r'\s+([.,;:!?])')
+    _SENTENCE_START_RE = re.compile(r'(^|(?<=[.!?])\s+)(\w)')
+    
     def __init__(self, remove_disfluencies=True, simplify_language=False):
         """
         Initialize the text processor.
@@ -59,11 +87,20 @@ class TextProcessor:
         # Extract segments
         segments = transcription.get("segments", [])
         
+        # Word counts are only needed for the stats logged at INFO level
+        count_words = logger.isEnabledFor(logging.INFO)
+        original_word_count = 0
+        processed_word_count = 0
+        
         # Process each segment
         processed_segments = []
         for segment in segments:
             processed_text = segment["text"]
             
+            # Blank segments would be dropped anyway, so skip the regex work
+            if not processed_text or processed_text.isspace():
+                continue
+            
             # Apply text processing
             if self.remove_disfluencies:
                 processed_text = self._remove_disfluencies(processed_text)
@@ -78,13 +115,17 @@ class TextProcessor:
                     "start": segment["start"],
                     "end": segment["end"],
                 })
+                
+                if count_words:
+                    processed_word_count += len(processed_text.split())
+            
+            if count_words:
+                original_word_count += len(segment["text"].split())
         
         # Log processing stats
-        original_word_count = sum(len(s["text"].split()) for s in segments)
-        processed_word_count = sum(len(s["text"].split()) for s in processed_segments)
-        reduction_percent = 100 * (original_word_count - processed_word_count) / original_word_count if original_word_count > 0 else 0
-        
-        logger.info(f"Processed transcription: {original_word_count} → {processed_word_count} words ({reduction_percent:.1f}% reduction)")
+        if count_words:
+            reduction_percent = 100 * (original_word_count - processed_word_count) / original_word_count if original_word_count > 0 else 0
+            logger.info(f"Processed transcription: {original_word_count} → {processed_word_count} words ({reduction_percent:.1f}% reduction)")
         
         return processed_segments
     
@@ -102,37 +143,46 @@ class TextProcessor:
         original_text = text
         
         # Remove disfluencies
-        for pattern in self.DISFLUENCIES:
-            text = re.sub(pattern, ' ', text, flags=re.IGNORECASE)
+        text = self._DISFLUENCY_RE.sub(' ', text)
         
         # Remove repetitions
-        for pattern in self.REPETITIONS:
-            text = re.sub(pattern, r'\1', text)
+        text = self._REPETITION_RE.sub(r'\1', text)
         
         # Remove false starts
-        for pattern in self.FALSE_STARTS:
-            matches = re.finditer(pattern, text, flags=re.IGNORECASE)
-            for match in matches:
-                # Find the part after "but" or "I mean", etc.
-                full_match = match.group(0)
-                split_point = re.search(r'\b(but|I mean|I think)\b', full_match, flags=re.IGNORECASE)
-                if split_point:
-                    replacement = full_match[split_point.start():]
-                    text = text.replace(full_match, replacement)
+        text = self._FALSE_START_RE.sub(self._trim_false_start, text)
         
         # Fix spacing and punctuation
-        text = re.sub(r'\s+', ' ', text)
-        text = re.sub(r'\s+([.,;:!?])', r'\1', text)
+        text = self._WHITESPACE_RE.sub(' ', text)
+        text = self._SPACE_BEFORE_PUNCTUATION_RE.sub(r'\1', text)
         
         # Capitalize first letter of sentences
         text = self._capitalize_sentences(text)
         
-        # Log changes if significant
-        if len(text.split()) < len(original_text.split()) * 0.8:
-            logger.debug(f"Significant disfluency removal: {len(original_text.split())} → {len(text.split())} words")
+        # Log changes if significant (counting words only when debug logging is on)
+        if logger.isEnabledFor(logging.DEBUG):
+            original_words = len(original_text.split())
+            words = len(text.split())
+            if words < original_words * 0.8:
+                logger.debug("Significant disfluency removal: %d → %d words", original_words, words)
         
         return text.strip()
     
+    def _trim_false_start(self, match):
+        """
+        Replace a false start with the part from "but", "I mean", etc. onwards.
+        
+        Args:
+            match: Match of a false start pattern
+            
+        Returns:
+            Replacement text
+        """
+        full_match = match.group(0)
+        split_point = self._FALSE_START_SPLIT_RE.search(full_match)
+        if split_point:
+            return full_match[split_point.start():]
+        return full_match
+    
     def _simplify_language(self, text):
         """
         Simplify language for easier understanding.
@@ -148,24 +198,19 @@ class TextProcessor:
         # a language model to simplify vocabulary and sentence structures
         
         # Here's a very basic implementation that just replaces some complex words
-        complex_words = {
-            r'\butilize\b': 'use',
-            r'\bprocure\b': 'get',
-            r'\boptimal\b': 'best',
-            r'\bpurchase\b': 'buy',
-            r'\bsufficient\b': 'enough',
-            r'\brequire\b': 'need',
-            r'\bobligation\b': 'duty',
-            r'\bterminat(e|ion)\b': 'end',
-            r'\binitiate\b': 'start',
-            r'\bfinaliz(e|ed)\b': 'finish',
-            r'\bsubsequent(ly)?\b': 'later',
-        }
-        
-        for complex_word, simple_word in complex_words.items():
-            text = re.sub(complex_word, simple_word, text, flags=re.IGNORECASE)
-        
-        return text
+        return self._COMPLEX_WORD_RE.sub(self._simple_word, text)
+    
+    def _simple_word(self, match):
+        """
+        Look up the simpler replacement for a matched complex word.
+        
+        Args:
+            match: Match of a complex word
+            
+        Returns:
+            Replacement text
+        """
+        return self.COMPLEX_WORDS[match.group(1).casefold()]
     
     def _capitalize_sentences(self, text):
         """
@@ -177,13 +222,4 @@ class TextProcessor:
         Returns:
             Text with capitalized sentences
         """
-        # Split text into sentences
-        sentences = re.split(r'([.!?])\s+', text)
-        
-        # Capitalize first letter of each sentence
-        for i in range(0, len(sentences), 2):
-            if sentences[i]:
-                sentences[i] = sentences[i][0].upper() + sentences[i][1:]
-        
-        # Join sentences
-        return ''.join(sentences)
\ No newline at end of file
+        return self._SENTENCE_START_RE.sub(lambda m: m.group(1) + m.group(2).upper(), text)
\ No newline at end of file
@@ -1,26 +1,81 @@
 """
 Transcription module for the Enhanced Speech Tool.
-Uses OpenAI's Whisper for local speech-to-text conversion.
+Uses Whisper (via faster-whisper/CTranslate2 by default) for local speech-to-text conversion.
 """
 
 import logging
 import os
+import re
 from pathlib import Path
 import json
 import time
+import wave
+from bisect import bisect_left, bisect_right
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain, compress, islice
 
-import whisper
-import torch
 import numpy as np
 
 logger = logging.getLogger("EnhancedSpeech.Transcriber")
 
+# Whisper operates on 16 kHz mono audio
+SAMPLE_RATE = 16000
+
+# Compact encoder for saved transcriptions, reused for every segment
+_JSON_ENCODER = json.JSONEncoder(separators=(',', ':'))
+
+
+def _cuda_available(backend):
+    """
+    Check whether a CUDA device is usable by a Whisper backend.
+    
+    Args:
+        backend: Inference backend ("faster-whisper" or "openai-whisper")
+    
+    Returns:
+        True if CUDA is available
+    """
+    # Ask CTranslate2 directly so faster-whisper never has to import torch
+    if backend == "faster-whisper":
+        import ctranslate2
+        return ctranslate2.get_cuda_device_count() > 0
+    
+    import torch
+    return torch.cuda.is_available()
+
+
+def _cuda_alloc_conf():
+    """
+    Build a PyTorch CUDA allocator configuration that limits fragmentation across files.
+    
+    Returns:
+        Value for PYTORCH_CUDA_ALLOC_CONF supported by the installed torch
+    """
+    from importlib.metadata import PackageNotFoundError, version
+    
+    conf = "max_split_size_mb:128"
+    
+    # Older torch releases reject unknown allocator options
+    try:
+        major, minor = (int(part) for part in version("torch").split(".")[:2])
+    except (PackageNotFoundError, ValueError):
+        return conf
+    
+    if (major, minor) >= (2, 1):
+        conf += ",expandable_segments:True"
+    return conf
+
+
 class WhisperTranscriber:
     """
-    Class for transcribing audio files using OpenAI's Whisper.
+    Class for transcribing audio files using Whisper.
     """
     
-    def __init__(self, model_size="base", device=None, language="en", compute_type="float16"):
+    BACKENDS = ("faster-whisper", "openai-whisper")
+    
+    def __init__(self, model_size="base", device=None, language="en", compute_type=None,
+                 backend="faster-whisper", vad_filter=True, batch_size=None,
+                 compile_model=False, use_daemon=False, temperature_fallback=True):
         """
         Initialize the transcriber.
         
@@ -28,27 +83,114 @@ class WhisperTranscriber:
             model_size: Whisper model size ("tiny", "base", "small", "medium", "large")
             device: Device to use for inference ("cpu", "cuda", or None for auto-detection)
             language: Language code for transcription
-            compute_type: Computation type ("float16", "float32", "int8")
+            compute_type: Computation type ("float16", "float32", "int8", "int8_float16", or None to
+                pick float16 on CUDA and int8 (float32 for openai-whisper) on CPU)
+            backend: Inference backend ("faster-whisper" or "openai-whisper")
+            vad_filter: Whether to skip non-speech audio before running Whisper
+            batch_size: Number of 30-second windows decoded together by the
+                faster-whisper backend (None for 16 on CUDA and unbatched on CPU)
+            compile_model: Whether to torch.compile the openai-whisper encoder
+            use_daemon: Whether to transcribe through a persistent Whisper daemon
+                that keeps the model loaded across runs
+            temperature_fallback: Whether to re-decode windows at higher temperatures
+                when greedy decoding fails the compression/log-probability checks
         """
+        if backend not in self.BACKENDS:
+            raise ValueError(f"Unsupported Whisper backend: {backend}")
+        
         self.model_size = model_size
         self.language = language
-        self.compute_type = compute_type
+        self.backend = backend
+        self.vad_filter = vad_filter
+        self.compile_model = compile_model
+        self.use_daemon = use_daemon
+        self.temperature_fallback = temperature_fallback
         
         # Determine device
         if device is None:
-            self.device = "cuda" if torch.cuda.is_available() else "cpu"
+            self.device = "cuda" if _cuda_available(backend) else "cpu"
         else:
             self.device = device
         
+        # Determine compute type
+        if compute_type is None:
+            if self.device == "cuda":
+                self.compute_type = "float16"
+            elif backend == "faster-whisper":
+                self.compute_type = "int8"
+            else:
+                self.compute_type = "float32"
+        else:
+            self.compute_type = compute_type
+        
+        if backend == "openai-whisper" and self.compute_type not in ("float16", "float32"):
+            raise ValueError(f"Compute type {self.compute_type} requires the faster-whisper backend")
+        
+        # Determine batch size (batched inference splits the audio on VAD boundaries)
+        if not vad_filter:
+            self.batch_size = 1
+        elif batch_size is None:
+            self.batch_size = 16 if self.device == "cuda" else 1
+        else:
+            self.batch_size = batch_size
+        
         self.model = None
-        logger.info(f"Initialized WhisperTranscriber with model_size={model_size}, device={self.device}, language={language}")
+        self._daemon_client = None
+        self._io_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="whisper-save")
+        logger.info(f"Initialized WhisperTranscriber with model_size={model_size}, backend={backend}, device={self.device}, compute_type={self.compute_type}, language={language}")
+    
+    def preload(self):
+        """Load the Whisper model ahead of the first transcription."""
+        if self.use_daemon:
+            self._get_daemon_client().ensure_running()
+        else:
+            self._load_model()
+    
+    def close(self):
+        """Wait for transcriptions still being saved in the background."""
+        self._io_pool.shutdown(wait=True)
+    
+    def _get_daemon_client(self):
+        """Get the client for the Whisper daemon serving this configuration."""
+        if self._daemon_client is None:
+            from src.whisper_daemon import WhisperDaemonClient
+            self._daemon_client = WhisperDaemonClient({
+                "model_size": self.model_size,
+                "backend": self.backend,
+                "device": self.device,
+                "language": self.language,
+                "compute_type": self.compute_type,
+                "vad_filter": self.vad_filter,
+                "batch_size": self.batch_size,
+                "temperature_fallback": self.temperature_fallback
+            })
+        return self._daemon_client
     
     def _load_model(self):
         """Load the Whisper model if not already loaded."""
         if self.model is None:
-            logger.info(f"Loading Whisper model: {self.model_size}")
+            logger.info(f"Loading Whisper model: {self.model_size} ({self.backend})")
             try:
-                self.model = whisper.load_model(self.model_size, device=self.device)
+                if self.backend == "faster-whisper":
+                    from faster_whisper import BatchedInferencePipeline, WhisperModel
+                    self.model = WhisperModel(
+                        self.model_size,
+                        device=self.device,
+                        compute_type=self.compute_type,
+                        cpu_threads=os.cpu_count() or 0
+                    )
+                    if self.batch_size > 1:
+                        self.model = BatchedInferencePipeline(model=self.model)
+                else:
+                    if self.device == "cuda":
+                        # Read when torch first allocates on CUDA; keep any user setting
+                        os.environ.setdefault("PYTORCH_CUDA_ALLOC_CONF", _cuda_alloc_conf())
+                    import torch
+                    import whisper
+                    self.model = whisper.load_model(self.model_size, device=self.device)
+                    if self.compile_model:
+                        # The encoder always sees fixed 30-second mel windows
+                        self.model.encoder = torch.compile(self.model.encoder, mode="reduce-overhead")
                 logger.info(f"Successfully loaded Whisper model")
             except Exception as e:
                 logger.error(f"Error loading Whisper model: {e}")
@@ -66,23 +208,88 @@ class WhisperTranscriber:
         Returns:
             Dictionary with transcription result
         """
-        logger.info(f"Transcribing audio: {audio_path}")
-        start_time = time.time()
+        if self.use_daemon:
+            logger.info(f"Transcribing audio via Whisper daemon: {audio_path}")
+            return self._get_daemon_client().transcribe(audio_path, word_timestamps, task)
         
         # Load model if not loaded
         self._load_model()
         
-        try:
-            # Set options
-            options = {
-                "fp16": False if self.device == "cpu" else True,
-                "language": self.language,
-                "task": task,
-                "word_timestamps": word_timestamps
-            }
+        return self._transcribe_file(audio_path, audio_path, word_timestamps, task)
+    
+    def transcribe_batch(self, audio_paths, word_timestamps=True, task="transcribe"):
+        """
+        Transcribe several audio files with one loaded model.
+        
+        Each file is decoded in the background while the previous one is being
+        transcribed, so the model is never left waiting on ffmpeg between files.
+        
+        Args:
+            audio_paths: Paths to the audio files
+            word_timestamps: Whether to generate timestamps for individual words
+            task: Task to perform ("transcribe" or "translate")
             
+        Returns:
+            List of transcription results, in the order of audio_paths
+        """
+        audio_paths = list(audio_paths)
+        if self.use_daemon:
+            client = self._get_daemon_client()
+            return [client.transcribe(audio_path, word_timestamps, task) for audio_path in audio_paths]
+        
+        logger.info(f"Transcribing {len(audio_paths)} audio files")
+        self._load_model()
+        
+        results = []
+        with ThreadPoolExecutor(max_workers=1) as decoder:
+            pending = decoder.submit(self._decode_audio, audio_paths[0]) if audio_paths else None
+            for i, audio_path in enumerate(audio_paths):
+                audio = pending.result()
+                if i + 1 < len(audio_paths):
+                    pending = decoder.submit(self._decode_audio, audio_paths[i + 1])
+                results.append(self._transcribe_file(audio_path, audio, word_timestamps, task))
+        
+        return results
+    
+    def _decode_audio(self, audio_path):
+        """
+        Decode an audio file to 16 kHz mono float32 samples.
+        
+        Args:
+            audio_path: Path to the audio file
+            
+        Returns:
+            Numpy array of samples
+        """
+        if self.backend == "faster-whisper":
+            from faster_whisper import decode_audio
+            return decode_audio(str(audio_path), sampling_rate=SAMPLE_RATE)
+        
+        import whisper
+        return whisper.audio.load_audio(str(audio_path), sr=SAMPLE_RATE)
+    
+    def _transcribe_file(self, audio_path, audio, word_timestamps, task):
+        """
+        Transcribe one audio file with the loaded model and save the result.
+        
+        Args:
+            audio_path: Path to the audio file
+            audio: Audio file path or decoded 16 kHz samples to transcribe
+            word_timestamps: Whether to generate timestamps for individual words
+            task: Task to perform ("transcribe" or "translate")
+            
+        Returns:
+            Dictionary with transcription result
+        """
+        logger.info(f"Transcribing audio: {audio_path}")
+        start_time = time.time()
+        
+        try:
             # Transcribe audio
-            result = self.model.transcribe(audio_path, **options)
+            if self.backend == "faster-whisper":
+                result = self._transcribe_faster_whisper(audio, word_timestamps, task)
+            else:
+                result = self._transcribe_openai_whisper(audio, word_timestamps, task)
             
             # Add some information about the transcription
             num_segments = len(result.get("segments", []))
@@ -99,7 +306,7 @@ class WhisperTranscriber:
                     sample = sample[:100] + "..."
                 logger.info(f"Sample transcription: {sample}")
             
-            # Save transcription to file (optional)
+            # Save transcription to file (the writes happen in the background)
             self._save_transcription(result, audio_path)
             
             return result
@@ -107,10 +314,208 @@ class WhisperTranscriber:
         except Exception as e:
             logger.error(f"Error transcribing audio: {e}")
             raise
+        
+        finally:
+            # Hand cached blocks back between files so reserved VRAM does not drift upwards
+            if self.backend == "openai-whisper" and self.device == "cuda":
+                import torch
+                torch.cuda.empty_cache()
+                torch.cuda.reset_peak_memory_stats()
+    
+    def _transcribe_faster_whisper(self, audio_path, word_timestamps, task):
+        """
+        Transcribe an audio file with faster-whisper.
+        
+        The lazily generated segments are materialized into the same dictionary
+        layout that openai-whisper returns, so downstream consumers are unaffected.
+        
+        Args:
+            audio_path: Path to the audio file, or decoded 16 kHz samples
+            word_timestamps: Whether to generate timestamps for individual words
+            task: Task to perform ("transcribe" or "translate")
+            
+        Returns:
+            Dictionary with transcription result
+        """
+        options = {
+            "language": self.language,
+            "task": task,
+            "beam_size": 1,
+            "vad_filter": self.vad_filter,
+            "word_timestamps": word_timestamps,
+            "without_timestamps": False,
+            # Fallback passes decode a single sample instead of best-of-5
+            "best_of": 1
+        }
+        if not self.temperature_fallback:
+            options["temperature"] = 0.0
+        if self.batch_size > 1:
+            options["batch_size"] = self.batch_size
+        
+        segments, info = self.model.transcribe(audio_path, **options)
+        
+        result_segments = []
+        for segment in segments:
+            entry = {
+                "id": segment.id,
+                "seek": segment.seek,
+                "start": segment.start,
+                "end": segment.end,
+                "text": segment.text,
+                "tokens": list(segment.tokens),
+                "temperature": segment.temperature,
+                "avg_logprob": segment.avg_logprob,
+                "compression_ratio": segment.compression_ratio,
+                "no_speech_prob": segment.no_speech_prob
+            }
+            if segment.words is not None:
+                entry["words"] = [
+                    {
+                        "word": word.word,
+                        "start": word.start,
+                        "end": word.end,
+                        "probability": word.probability
+                    }
+                    for word in segment.words
+                ]
+            result_segments.append(entry)
+        
+        return {
+            "text": "".join(segment["text"] for segment in result_segments),
+            "segments": result_segments,
+            "language": info.language
+        }
+    
+    def _transcribe_openai_whisper(self, audio_path, word_timestamps, task):
+        """
+        Transcribe an audio file with openai-whisper.
+        
+        When VAD filtering is enabled, only the voiced intervals are fed to the
+        model and the resulting timestamps are mapped back onto the original timeline.
+        
+        Args:
+            audio_path: Path to the audio file, or decoded 16 kHz samples
+            word_timestamps: Whether to generate timestamps for individual words
+            task: Task to perform ("transcribe" or "translate")
+            
+        Returns:
+            Dictionary with transcription result
+        """
+        import whisper
+        
+        options = {
+            "fp16": self.compute_type == "float16",
+            "language": self.language,
+            "task": task,
+            "word_timestamps": word_timestamps
+        }
+        if not self.temperature_fallback:
+            options["temperature"] = 0.0
+        
+        if isinstance(audio_path, np.ndarray):
+            audio = audio_path
+        else:
+            audio = whisper.audio.load_audio(str(audio_path), sr=SAMPLE_RATE)
+        
+        intervals = self._vad_segments(audio) if self.vad_filter else None
+        if intervals is not None:
+            if not intervals:
+                logger.info("No speech detected in audio")
+                return {"text": "", "segments": [], "language": self.language}
+            
+            voiced = np.concatenate([audio[start:end] for start, end in intervals])
+            logger.info(f"VAD kept {len(voiced) / SAMPLE_RATE:.2f} of {len(audio) / SAMPLE_RATE:.2f} seconds of audio")
+            audio = voiced
+        
+        # Whisper computes the log-mel spectrogram on the device of the audio it is
+        # given, so handing it a CUDA tensor moves the STFT off the CPU
+        if self.device == "cuda":
+            import torch
+            audio = torch.from_numpy(audio).to(self.device)
+        
+        result = self.model.transcribe(audio, **options)
+        if intervals is not None:
+            self._restore_timestamps(result, intervals)
+        return result
+    
+    def _vad_segments(self, audio, aggressiveness=2, frame_ms=30, padding_ms=300):
+        """
+        Detect voiced intervals in an audio signal with WebRTC VAD.
+        
+        Args:
+            audio: 16 kHz mono float32 samples
+            aggressiveness: WebRTC VAD aggressiveness (0-3)
+            frame_ms: Frame length in milliseconds (10, 20, or 30)
+            padding_ms: Padding kept around each voiced frame
+            
+        Returns:
+            List of (start, end) sample offsets, or None if VAD is unavailable
+        """
+        try:
+            import webrtcvad
+        except ImportError:
+            logger.warning("webrtcvad not installed; transcribing without VAD filtering")
+            logger.warning("Install with: pip install webrtcvad")
+            return None
+        
+        vad = webrtcvad.Vad(aggressiveness)
+        frame_length = SAMPLE_RATE * frame_ms // 1000
+        padding = SAMPLE_RATE * padding_ms // 1000
+        pcm = (np.clip(audio, -1.0, 1.0) * 32767).astype(np.int16).tobytes()
+        
+        intervals = []
+        for offset in range(0, len(audio) - frame_length + 1, frame_length):
+            frame = pcm[offset * 2:(offset + frame_length) * 2]
+            if not vad.is_speech(frame, SAMPLE_RATE):
+                continue
+            
+            start = max(0, offset - padding)
+            end = min(len(audio), offset + frame_length + padding)
+            if intervals and start <= intervals[-1][1]:
+                # Merge with the previous interval
+                intervals[-1][1] = end
+            else:
+                intervals.append([start, end])
+        
+        return [(start, end) for start, end in intervals]
+    
+    def _restore_timestamps(self, result, intervals):
+        """
+        Map timestamps from the concatenated voiced audio back to the original audio.
+        
+        Args:
+            result: Transcription result for the voiced audio (modified in place)
+            intervals: List of (start, end) sample offsets that were transcribed
+        """
+        # Offset of each interval within the concatenated voiced audio
+        voiced_offsets = []
+        total = 0
+        for start, end in intervals:
+            voiced_offsets.append(total)
+            total += end - start
+        
+        def to_original(seconds, is_end=False):
+            position = seconds * SAMPLE_RATE
+            # An end time on an interval boundary belongs to the interval it closes
+            if is_end:
+                index = bisect_left(voiced_offsets, position) - 1
+            else:
+                index = bisect_right(voiced_offsets, position) - 1
+            index = max(0, index)
+            return (intervals[index][0] + position - voiced_offsets[index]) / SAMPLE_RATE
+        
+        for segment in result.get("segments", []):
+            segment["start"] = to_original(segment["start"])
+            segment["end"] = to_original(segment["end"], is_end=True)
+            for word in segment.get("words", []):
+                word["start"] = to_original(word["start"])
+                word["end"] = to_original(word["end"], is_end=True)
     
     def _save_transcription(self, result, audio_path, output_dir=None):
         """
         Save transcription to file.
+        The file contents are encoded before returning, so callers may modify the
+        result afterwards, and only the writes run on the background I/O pool.
         
         Args:
             result: Transcription result
@@ -127,18 +532,45 @@ class WhisperTranscriber:
             # Create directory if it doesn't exist
             output_dir.mkdir(parents=True, exist_ok=True)
             
-            # Save transcription to JSON file
+            # Build the JSON and the text transcript in one pass over the segments
             json_path = output_dir / f"{audio_path.stem}_transcription.json"
-            with open(json_path, 'w') as f:
-                json.dump(result, f, indent=2)
-            
-            # Save transcript to text file
             text_path = output_dir / f"{audio_path.stem}_transcript.txt"
-            with open(text_path, 'w') as f:
-                f.write(result["text"])
-                f.write("\n\n--- Segments ---\n\n")
-                for i, segment in enumerate(result.get("segments", [])):
-                    f.write(f"[{segment['start']:.2f} - {segment['end']:.2f}] {segment['text']}\n")
+            text_parts = [result["text"], "\n\n--- Segments ---\n\n"]
+            
+            # Encode everything but the segments, leaving the object open
+            header = {key: value for key, value in result.items() if key != "segments"}
+            json_parts = [_JSON_ENCODER.encode(header)[:-1], ',"segments":[' if header else '"segments":[']
+            
+            # Encode segment by segment instead of serializing the whole result at once
+            segment_parts = []
+            for segment in result.get("segments", []):
+                segment_parts.append(_JSON_ENCODER.encode(segment))
+                text_parts.append(f"[{segment['start']:.2f} - {segment['end']:.2f}] {segment['text']}\n")
+            json_parts.append(",".join(segment_parts))
+            json_parts.append("]}")
+            
+            self._io_pool.submit(
+                self._write_transcription, json_path, "".join(json_parts), text_path, "".join(text_parts)
+            )
+        
+        except Exception as e:
+            logger.warning(f"Error saving transcription: {e}")
+    
+    @staticmethod
+    def _write_transcription(json_path, json_text, text_path, text):
+        """
+        Write encoded transcription files.
+        
+        Args:
+            json_path: Path to the JSON transcription file
+            json_text: Encoded JSON transcription
+            text_path: Path to the text transcript file
+            text: Text transcript
+        """
+        try:
+            # Write each file with a single call
+            json_path.write_text(json_text, encoding="utf-8")
+            text_path.write_text(text, encoding="utf-8")
             
             logger.debug(f"Saved transcription to {json_path} and {text_path}")
         
@@ -149,6 +581,11 @@ class WhisperTranscriber:
 class TranscriptionEnhancer:
     """Class for enhancing transcription with additional features."""
     
+    # Punctuation with the whitespace around it, normalized in a single pass
+    _PUNCTUATION_RE = re.compile(r"\s*([,.!?:;])\s*")
+    # Anything the normalization would change in already stripped text
+    _NEEDS_NORMALIZING_RE = re.compile(r"\s[,.!?:;]|[,.!?:;]\S|[^\S ]| {2}")
+    
     def __init__(self, language_model=None, confidence_threshold=0.5):
         """
         Initialize the transcription enhancer.
@@ -173,14 +610,22 @@ class TranscriptionEnhancer:
         """
         logger.info("Enhancing transcription...")
         
-        # Filter low-confidence words if available
+        # Filter low-confidence words if available, comparing every word in one array
         if "segments" in transcription:
-            for segment in transcription["segments"]:
-                if "words" in segment:
-                    segment["words"] = [
-                        word for word in segment["words"]
-                        if word.get("confidence", 1.0) >= self.confidence_threshold
-                    ]
+            segments = [segment for segment in transcription["segments"] if "words" in segment]
+            words = list(chain.from_iterable(segment["words"] for segment in segments))
+            confidences = np.fromiter(
+                (word.get("confidence", 1.0) for word in words),
+                dtype=np.float64,
+                count=len(words)
+            )
+            mask = confidences >= self.confidence_threshold
+            
+            # Only rebuild the word lists when something is actually dropped
+            if not mask.all():
+                keep = iter(mask.tolist())
+                for segment in segments:
+                    segment["words"] = list(compress(segment["words"], islice(keep, len(segment["words"]))))
         
         # Apply language model rescoring if available
         if self.language_model and "segments" in transcription:
@@ -220,31 +665,23 @@ class TranscriptionEnhancer:
         """
         # This is a basic punctuation normalization
         if "segments" in transcription:
+            texts = []
             for segment in transcription["segments"]:
-                # Fix spacing around punctuation
-                text = segment["text"]
-                text = text.replace(" ,", ",")
-                text = text.replace(" .", ".")
-                text = text.replace(" !", "!")
-                text = text.replace(" ?", "?")
-                text = text.replace(" :", ":")
-                text = text.replace(" ;", ";")
-                
-                # Ensure space after punctuation
-                text = text.replace(",", ", ")
-                text = text.replace(".", ". ")
-                text = text.replace("!", "! ")
-                text = text.replace("?", "? ")
-                text = text.replace(":", ": ")
-                text = text.replace(";", "; ")
+                text = segment["text"].strip()
                 
-                # Remove double spaces
-                text = " ".join(text.split())
+                # Most segments are already clean, so only rewrite when needed
+                if self._NEEDS_NORMALIZING_RE.search(text):
+                    # Fix spacing around punctuation: none before, one after
+                    text = self._PUNCTUATION_RE.sub(r"\1 ", text)
+                    
+                    # Remove double spaces
+                    text = " ".join(text.split())
                 
                 segment["text"] = text
+                texts.append(text)
             
             # Also update the full text
-            transcription["text"] = " ".join(segment["text"] for segment in transcription["segments"])
+            transcription["text"] = " ".join(texts)
         
         return transcription
 
@@ -259,9 +696,17 @@ def get_audio_duration(audio_path):
     Returns:
         Duration in seconds
     """
+    # WAV headers (such as the extracted audio) give the duration without decoding
+    try:
+        with wave.open(str(audio_path), "rb") as f:
+            return f.getnframes() / f.getframerate()
+    except (wave.Error, EOFError, OSError):
+        pass
+    
     try:
-        info = whisper.audio.load_audio(audio_path, sr=16000)
-        duration = len(info) / 16000
+        from faster_whisper import decode_audio
+        info = decode_audio(audio_path, sampling_rate=SAMPLE_RATE)
+        duration = len(info) / SAMPLE_RATE
         return duration
     except Exception as e:
         logger.error(f"Error getting audio duration: {e}")
@@ -0,0 +1,255 @@
+"""
+Whisper daemon for the Enhanced Speech Tool.
+Keeps a loaded (and, where supported, compiled) Whisper model warm across runs
+and serves transcription requests over a Unix domain socket.
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import socket
+import socketserver
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+from src.transcriber import WhisperTranscriber, SAMPLE_RATE
+
+logger = logging.getLogger("EnhancedSpeech.WhisperDaemon")
+
+
+def socket_path(settings):
+    """
+    Get the socket path for a daemon serving the given transcriber settings.
+    
+    Args:
+        settings: Dictionary of WhisperTranscriber keyword arguments
+    
+    Returns:
+        Path to the Unix socket
+    """
+    key = hashlib.sha256(json.dumps(settings, sort_keys=True).encode()).hexdigest()[:16]
+    return Path.home() / ".cache" / "enhanced_speech" / f"whisper-{key}.sock"
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    """Handle one newline-delimited JSON transcription request."""
+    
+    def handle(self):
+        try:
+            request = json.loads(self.rfile.readline())
+            result = self.server.transcriber.transcribe(
+                request["audio_path"],
+                word_timestamps=request.get("word_timestamps", True),
+                task=request.get("task", "transcribe")
+            )
+            response = {"result": result}
+        except Exception as e:
+            logger.error(f"Error handling request: {e}")
+            response = {"error": str(e)}
+        
+        self.wfile.write(json.dumps(response).encode() + b"\n")
+
+
+class WhisperDaemon(socketserver.UnixStreamServer):
+    """Unix socket server holding a warm WhisperTranscriber."""
+    
+    def __init__(self, path, settings):
+        """
+        Initialize the daemon and load the model.
+        
+        Args:
+            path: Path to the Unix socket to listen on
+            settings: Dictionary of WhisperTranscriber keyword arguments
+        """
+        self.transcriber = WhisperTranscriber(compile_model=True, **settings)
+        self.transcriber.preload()
+        self._warmup()
+        
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if path.exists():
+            path.unlink()
+        super().__init__(str(path), _RequestHandler)
+        logger.info(f"Whisper daemon listening on {path}")
+    
+    def _warmup(self):
+        """Run the model once on silence so compilation happens before the first request."""
+        if self.transcriber.backend != "openai-whisper":
+            return
+        
+        logger.info("Warming up Whisper model...")
+        start_time = time.time()
+        silence = np.zeros(SAMPLE_RATE * 30, dtype=np.float32)
+        self.transcriber.model.transcribe(
+            silence,
+            fp16=self.transcriber.compute_type == "float16",
+            language=self.transcriber.language
+        )
+        logger.info(f"Warmup took {time.time() - start_time:.2f} seconds")
+
+
+class WhisperDaemonClient:
+    """Client that forwards transcription requests to a WhisperDaemon."""
+    
+    def __init__(self, settings, start_timeout=300):
+        """
+        Initialize the client.
+        
+        Args:
+            settings: Dictionary of WhisperTranscriber keyword arguments
+            start_timeout: Seconds to wait for a newly spawned daemon to come up
+        """
+        self.settings = settings
+        self.start_timeout = start_timeout
+        self.path = socket_path(settings)
+    
+    def _connect(self):
+        """Connect to the daemon socket."""
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            sock.connect(str(self.path))
+        except OSError:
+            sock.close()
+            raise
+        return sock
+    
+    def ensure_running(self):
+        """Spawn the daemon if it is not already accepting connections."""
+        try:
+            self._connect().close()
+            return
+        except OSError:
+            pass
+        
+        logger.info(f"Starting Whisper daemon on {self.path}")
+        command = [sys.executable, "-m", "src.whisper_daemon", "--socket", str(self.path)]
+        for key, value in self.settings.items():
+            if value is not None:
+                command.extend([f"--{key.replace('_', '-')}", str(value)])
+        
+        # Keep the daemon's log next to its socket so startup failures can be reported
+        log_path = self.path.with_suffix(".log")
+        log_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(log_path, 'wb') as log_file:
+            process = subprocess.Popen(
+                command,
+                cwd=Path(__file__).resolve().parent.parent,
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.DEVNULL,
+                stderr=log_file,
+                start_new_session=True
+            )
+        
+        # Wait for the daemon to load the model and start listening
+        deadline = time.time() + self.start_timeout
+        while time.time() < deadline:
+            try:
+                self._connect().close()
+                return
+            except OSError:
+                pass
+            
+            if process.poll() is not None:
+                raise RuntimeError(
+                    f"Whisper daemon exited with code {process.returncode} during startup:\n"
+                    f"{self._log_tail(log_path)}"
+                )
+            time.sleep(0.5)
+        raise RuntimeError(
+            f"Whisper daemon did not start within {self.start_timeout} seconds:\n"
+            f"{self._log_tail(log_path)}"
+        )
+    
+    @staticmethod
+    def _log_tail(log_path, lines=20):
+        """
+        Get the last lines of the daemon log.
+        
+        Args:
+            log_path: Path to the daemon log file
+            lines: Number of lines to return
+        
+        Returns:
+            Tail of the log as a string
+        """
+        try:
+            with open(log_path, 'r', errors="replace") as f:
+                return "".join(f.readlines()[-lines:]).rstrip()
+        except OSError:
+            return "(no daemon log available)"
+    
+    def transcribe(self, audio_path, word_timestamps=True, task="transcribe"):
+        """
+        Transcribe an audio file using the daemon.
+        
+        Args:
+            audio_path: Path to the audio file
+            word_timestamps: Whether to generate timestamps for individual words
+            task: Task to perform ("transcribe" or "translate")
+        
+        Returns:
+            Dictionary with transcription result
+        """
+        self.ensure_running()
+        
+        request = {
+            "audio_path": str(Path(audio_path).resolve()),
+            "word_timestamps": word_timestamps,
+            "task": task
+        }
+        with self._connect() as sock:
+            sock.sendall(json.dumps(request).encode() + b"\n")
+            with sock.makefile("rb") as f:
+                response = json.loads(f.readline())
+        
+        if "error" in response:
+            raise RuntimeError(f"Whisper daemon error: {response['error']}")
+        return response["result"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Whisper daemon for the Enhanced Speech Tool")
+    parser.add_argument("--socket", required=True, help="Unix socket path")
+    parser.add_argument("--model-size", default="base", help="Whisper model size")
+    parser.add_argument("--backend", default="faster-whisper", help="Whisper backend")
+    parser.add_argument("--device", help="Device to use for inference")
+    parser.add_argument("--language", default="en", help="Language code")
+    parser.add_argument("--compute-type", help="Computation type")
+    parser.add_argument("--vad-filter", default="True", help="Whether to apply VAD filtering")
+    parser.add_argument("--batch-size", type=int, help="Batch size for batched inference")
+    parser.add_argument("--temperature-fallback", default="True", help="Whether to retry failed windows at higher temperatures")
+    args = parser.parse_args()
+    
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        handlers=[logging.StreamHandler()]
+    )
+    
+    settings = {
+        "model_size": args.model_size,
+        "backend": args.backend,
+        "device": args.device,
+        "language": args.language,
+        "compute_type": args.compute_type,
+        "vad_filter": args.vad_filter.lower() in ["true", "yes", "1"],
+        "batch_size": args.batch_size,
+        "temperature_fallback": args.temperature_fallback.lower() in ["true", "yes", "1"]
+    }
+    
+    with WhisperDaemon(args.socket, settings) as server:
+        try:
+            server.serve_forever()
+        finally:
+            if os.path.exists(args.socket):
+                os.unlink(args.socket)
+
+
+if __name__ == "__main__":
+    main()